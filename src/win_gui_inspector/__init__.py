@@ -13,13 +13,34 @@ Usage:
     inspector = UIInspector(window_title="MarketSpeed", max_depth=4)
 """
 
-__version__ = "0.1.0"
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from win_gui_inspector.inspector import UIInspector
+    from win_gui_inspector.mapper import WindowMapper
 
-from win_gui_inspector.inspector import UIInspector
-from win_gui_inspector.mapper import WindowMapper
+__version__ = "0.1.0"
 
 __all__ = [
     "__version__",
     "UIInspector",
     "WindowMapper",
 ]
+
+
+def __getattr__(name: str):  # PEP 562
+    """Resolve the public classes lazily.
+
+    Importing pywinauto triggers comtypes UIA typelib loading, which can
+    take seconds on first import; fast paths like ``--version`` should not
+    pay for it.
+    """
+    if name == "UIInspector":
+        from win_gui_inspector.inspector import UIInspector
+
+        return UIInspector
+    if name == "WindowMapper":
+        from win_gui_inspector.mapper import WindowMapper
+
+        return WindowMapper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,176 @@
+"""comtypes-level UI Automation helpers.
+
+Batches UIA property reads through an IUIAutomation cache request so that
+scanning a subtree costs one cross-process COM call instead of several per
+element (Name, ControlType, AutomationId, ClassName and BoundingRectangle are
+all pre-fetched by a single ``BuildUpdatedCache``).
+
+Everything here degrades gracefully: when comtypes or the UIA backend is
+unavailable (non-Windows, win32 backend, mocked elements in tests), callers
+fall back to the plain pywinauto attribute path.
+"""
+
+from __future__ import annotations
+
+import contextlib
+from ctypes import POINTER
+from typing import Any
+
+try:
+    import comtypes
+    from comtypes import COMError
+except ImportError:  # pragma: no cover - comtypes is Windows-only
+    comtypes = None  # type: ignore[assignment]
+
+    class COMError(Exception):  # type: ignore[no-redef]
+        """Placeholder so except clauses stay valid without comtypes."""
+
+
+try:
+    from pywinauto.controls.uiawrapper import UIAWrapper
+    from pywinauto.uia_defines import IUIA
+    from pywinauto.uia_element_info import UIAElementInfo
+
+    UIA_AVAILABLE = True
+except ImportError:  # pragma: no cover - UIA backend is Windows-only
+    IUIA = None  # type: ignore[assignment]
+    UIAWrapper = None  # type: ignore[assignment, misc]
+    UIAElementInfo = None  # type: ignore[assignment, misc]
+    UIA_AVAILABLE = False
+
+# Properties pre-fetched for every element in a cached scan.
+_CACHED_PROPERTY_NAMES = (
+    "UIA_NamePropertyId",
+    "UIA_ControlTypePropertyId",
+    "UIA_AutomationIdPropertyId",
+    "UIA_ClassNamePropertyId",
+    "UIA_BoundingRectanglePropertyId",
+)
+
+
+def co_initialize() -> None:
+    """Initialize COM for the current thread (no-op without comtypes)."""
+    if comtypes is not None:
+        with contextlib.suppress(OSError):
+            comtypes.CoInitialize()
+
+
+def co_uninitialize() -> None:
+    """Release this thread's COM initialization (no-op without comtypes)."""
+    if comtypes is not None:
+        with contextlib.suppress(OSError):
+            comtypes.CoUninitialize()
+
+
+def get_raw_element(element: Any) -> Any | None:
+    """Return the raw IUIAutomationElement behind a pywinauto wrapper.
+
+    Returns None when the wrapper does not expose a genuine COM element
+    (win32 backend, test doubles), so callers know to take the slow path.
+    """
+    if not UIA_AVAILABLE:
+        return None
+
+    info = getattr(element, "element_info", None)
+    raw = getattr(info, "element", None)
+    if raw is None:
+        return None
+
+    try:
+        elem_iface = IUIA().ui_automation_client.IUIAutomationElement
+        if isinstance(raw, POINTER(elem_iface)):
+            return raw
+    except (COMError, OSError, TypeError):
+        pass
+    return None
+
+
+def build_cache_request(capture_rect: bool = True) -> Any:
+    """Build a cache request that pre-fetches the scan properties for a subtree.
+
+    ``AutomationElementMode_None`` skips full element references; the cached
+    tree is materialized in-process by a single ``BuildUpdatedCache`` call.
+    The bounding rectangle is only fetched when ``capture_rect`` is set.
+    """
+    uia = IUIA()
+    cache_req = uia.iuia.CreateCacheRequest()
+    for prop_name in _CACHED_PROPERTY_NAMES:
+        if not capture_rect and prop_name == "UIA_BoundingRectanglePropertyId":
+            continue
+        cache_req.AddProperty(getattr(uia.UIA_dll, prop_name))
+    cache_req.TreeScope = uia.UIA_dll.TreeScope_Subtree
+    cache_req.AutomationElementMode = uia.UIA_dll.AutomationElementMode_None
+    return cache_req
+
+
+def walk_children(raw_elem: Any):
+    """Yield raw children of a raw element via the RawViewWalker.
+
+    ``GetFirstChildElement``/``GetNextSiblingElement`` enumerate one sibling
+    at a time, which is far cheaper than the ``FindAll`` call behind
+    ``element.children()`` on deep trees.
+    """
+    walker = IUIA().iuia.RawViewWalker
+    child = walker.GetFirstChildElement(raw_elem)
+    while child:
+        yield child
+        child = walker.GetNextSiblingElement(child)
+
+
+def iter_children(element: Any):
+    """Yield child wrappers of a pywinauto element.
+
+    Uses the RawViewWalker when a raw COM element is available and falls
+    back to ``element.children()`` otherwise (win32 backend, test doubles).
+    """
+    raw = get_raw_element(element)
+    if raw is None:
+        yield from element.children()
+        return
+
+    for child in walk_children(raw):
+        yield UIAWrapper(UIAElementInfo(child))
+
+
+def cached_name(cached_elem: Any) -> str:
+    """Read the cached Name property."""
+    return cached_elem.CachedName or ""
+
+
+def cached_control_type(cached_elem: Any) -> str:
+    """Read the cached ControlType property as a friendly name."""
+    return IUIA().known_control_type_ids.get(cached_elem.CachedControlType, "")
+
+
+def cached_automation_id(cached_elem: Any) -> str:
+    """Read the cached AutomationId property."""
+    return cached_elem.CachedAutomationId or ""
+
+
+def cached_class_name(cached_elem: Any) -> str:
+    """Read the cached ClassName property."""
+    return cached_elem.CachedClassName or ""
+
+
+def cached_rectangle(cached_elem: Any) -> dict | None:
+    """Read the cached BoundingRectangle as a left/top/width/height dict."""
+    try:
+        rect = cached_elem.CachedBoundingRectangle
+        return {
+            "left": rect.left,
+            "top": rect.top,
+            "width": rect.right - rect.left,
+            "height": rect.bottom - rect.top,
+        }
+    except (COMError, AttributeError, ValueError):
+        return None
+
+
+def cached_children(cached_elem: Any) -> list:
+    """Return the cached children materialized by the cache request."""
+    array = cached_elem.GetCachedChildren()
+    # A NULL COM pointer is falsy but not None (same convention as the
+    # walker loop in walk_children).
+    if not array:
+        return []
+    return [array.GetElement(i) for i in range(array.Length)]
@@ -9,70 +9,148 @@ Usage:
 
 from __future__ import annotations
 
-import argparse
 import sys
+from types import SimpleNamespace
+from typing import NoReturn
+
+_USAGE = """\
+usage: win-gui-inspector [--version] {inspect,map} [options]
+
+Windows GUI element inspector and mapper
+
+commands:
+  inspect   Interactively inspect UI elements
+  map       Map all windows and elements
+
+inspect options:
+  --title PATTERN     Window title pattern (regex)
+  --class-name NAME   Window class name
+  --depth N           Max scan depth (default: 4)
+  --export            Scan and export to YAML immediately
+  --screen NAME       Screen name label for export (default: main)
+  --output PATH       Output path for YAML export
+  --backend NAME      pywinauto backend (default: uia)
+  --no-rect           Skip bounding rectangles (fewer COM calls per element)
+  --fast              Export as JSON (a YAML subset); much faster on large scans
+
+map options:
+  --title PATTERN     Window title pattern (regex)
+  --export PATH       Export element map to JSON file
+  --depth N           Max scan depth (default: 5)
+  --backend NAME      pywinauto backend (default: uia)
+  --quiet             Suppress the per-element console listing
+"""
 
-
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        prog="win-gui-inspector",
-        description="Windows GUI element inspector and mapper",
-    )
-
-    parser.add_argument("--version", action="store_true", help="Show version and exit")
-
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
-
-    # Inspect command
-    inspect_parser = subparsers.add_parser(
-        "inspect",
-        help="Interactively inspect UI elements",
-    )
-    inspect_parser.add_argument(
-        "--title", type=str, default=None, help="Window title pattern (regex)"
-    )
-    inspect_parser.add_argument(
-        "--class-name", type=str, default=None, help="Window class name"
-    )
-    inspect_parser.add_argument(
-        "--depth", type=int, default=4, help="Max scan depth (default: 4)"
-    )
-    inspect_parser.add_argument(
-        "--export", action="store_true", help="Scan and export to YAML immediately"
-    )
-    inspect_parser.add_argument(
-        "--screen", type=str, default="main", help="Screen name label for export"
-    )
-    inspect_parser.add_argument(
-        "--output", type=str, default=None, help="Output path for YAML export"
-    )
-    inspect_parser.add_argument(
-        "--backend", type=str, default="uia", help="pywinauto backend (default: uia)"
-    )
-
-    # Map command
-    map_parser = subparsers.add_parser(
-        "map",
-        help="Map all windows and elements",
-    )
-    map_parser.add_argument(
-        "--title", type=str, default=None, help="Window title pattern (regex)"
-    )
-    map_parser.add_argument(
-        "--export", type=str, default=None, help="Export element map to JSON file"
-    )
-    map_parser.add_argument(
-        "--depth", type=int, default=5, help="Max scan depth (default: 5)"
-    )
-    map_parser.add_argument(
-        "--backend", type=str, default="uia", help="pywinauto backend (default: uia)"
-    )
-
-    return parser.parse_args()
-
-
-def cmd_inspect(args: argparse.Namespace) -> int:
+# Per command: attribute defaults, boolean flags, and value-taking options
+# with their converters.
+_COMMANDS: dict[str, tuple[dict, dict[str, str], dict[str, tuple[str, type]]]] = {
+    "inspect": (
+        {
+            "title": None,
+            "class_name": None,
+            "depth": 4,
+            "export": False,
+            "screen": "main",
+            "output": None,
+            "backend": "uia",
+            "no_rect": False,
+            "fast": False,
+        },
+        {"--export": "export", "--no-rect": "no_rect", "--fast": "fast"},
+        {
+            "--title": ("title", str),
+            "--class-name": ("class_name", str),
+            "--depth": ("depth", int),
+            "--screen": ("screen", str),
+            "--output": ("output", str),
+            "--backend": ("backend", str),
+        },
+    ),
+    "map": (
+        {
+            "title": None,
+            "export": None,
+            "depth": 5,
+            "backend": "uia",
+            "quiet": False,
+        },
+        {"--quiet": "quiet"},
+        {
+            "--title": ("title", str),
+            "--export": ("export", str),
+            "--depth": ("depth", int),
+            "--backend": ("backend", str),
+        },
+    ),
+}
+
+
+def _fail(message: str) -> NoReturn:
+    sys.stderr.write(f"win-gui-inspector: error: {message}\n")
+    raise SystemExit(2)
+
+
+def parse_args() -> SimpleNamespace:
+    """Parse command line arguments.
+
+    Hand-rolled single pass over ``sys.argv`` instead of argparse: building
+    the parser tree and help formatter costs tens of milliseconds on every
+    CLI start, which dominates fast commands like ``--version``.
+    """
+    argv = sys.argv[1:]
+    args = SimpleNamespace(version=False, command=None)
+
+    if not argv:
+        return args
+    if argv[0] in ("--version", "-V"):
+        args.version = True
+        return args
+    if argv[0] in ("--help", "-h"):
+        print(_USAGE)
+        raise SystemExit(0)
+
+    command = argv[0]
+    if command not in _COMMANDS:
+        _fail(f"unknown command: {command!r} (choose from 'inspect', 'map')")
+
+    defaults, flags, value_opts = _COMMANDS[command]
+    args.command = command
+    vars(args).update(defaults)
+
+    i = 1
+    while i < len(argv):
+        token = argv[i]
+        if token in ("--help", "-h"):
+            print(_USAGE)
+            raise SystemExit(0)
+        # Both "--opt value" and "--opt=value" spellings are accepted.
+        opt, eq, inline_value = token.partition("=")
+        if opt in flags:
+            if eq:
+                _fail(f"option {opt} does not take a value")
+            setattr(args, flags[opt], True)
+            i += 1
+        elif opt in value_opts:
+            if eq:
+                value = inline_value
+                i += 1
+            elif i + 1 < len(argv):
+                value = argv[i + 1]
+                i += 2
+            else:
+                _fail(f"option {opt} requires a value")
+            attr, convert = value_opts[opt]
+            try:
+                setattr(args, attr, convert(value))
+            except ValueError:
+                _fail(f"invalid value for {opt}: {value!r}")
+        else:
+            _fail(f"unknown option for {command}: {token}")
+
+    return args
+
+
+def cmd_inspect(args: SimpleNamespace) -> int:
     """Run the inspect command."""
     from win_gui_inspector.inspector import UIInspector
 
@@ -80,6 +158,7 @@ def cmd_inspect(args: argparse.Namespace) -> int:
         window_title=args.title,
         max_depth=args.depth,
         backend=args.backend,
+        capture_rect=not args.no_rect,
     )
 
     if not inspector.connect():
@@ -87,14 +166,14 @@ def cmd_inspect(args: argparse.Namespace) -> int:
 
     if args.export:
         inspector.scan_current_screen(args.screen)
-        inspector.export_to_yaml(args.output)
+        inspector.export_to_yaml(args.output, fast=args.fast)
     else:
         inspector.interactive_mode()
 
     return 0
 
 
-def cmd_map(args: argparse.Namespace) -> int:
+def cmd_map(args: SimpleNamespace) -> int:
     """Run the map command."""
     from win_gui_inspector.mapper import WindowMapper
 
@@ -104,7 +183,7 @@ def cmd_map(args: argparse.Namespace) -> int:
         backend=args.backend,
     )
 
-    mapper.run(export_path=args.export)
+    mapper.run(export_path=args.export, quiet=args.quiet)
     return 0
 
 
@@ -124,10 +203,6 @@ def main() -> int:
     if args.command == "map":
         return cmd_map(args)
 
-    # No command — show help
-    parse_args()  # Will show usage if no args
+    # No command — show usage
+    print(_USAGE)
     return 0
-
-
-if __name__ == "__main__":
-    sys.exit(main())
@@ -7,21 +7,64 @@ Uses pywinauto Desktop(backend="uia") to connect to any Windows application.
 from __future__ import annotations
 
 import contextlib
-import io
+import functools
 import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
-import yaml
 from pywinauto import Desktop
 
+from win_gui_inspector import _uia
 
+
+@functools.cache
 def _ensure_utf8_output() -> None:
-    """Force UTF-8 output for non-ASCII text on Windows."""
-    if hasattr(sys.stdout, "buffer"):
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    if hasattr(sys.stderr, "buffer"):
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+    """Force UTF-8 output for non-ASCII text on Windows.
+
+    reconfigure() keeps the existing stream object (and its line buffering)
+    instead of wrapping it in a fresh TextIOWrapper. Cached so repeated
+    connects reconfigure the streams only once per process.
+    """
+    for stream in (sys.stdout, sys.stderr):
+        reconfigure = getattr(stream, "reconfigure", None)
+        if reconfigure is not None:
+            reconfigure(encoding="utf-8", errors="replace")
+
+
+# Control types highlighted in summaries and grouped in YAML exports.
+_KEY_CONTROL_TYPES = ("Button", "Edit", "MenuItem", "TabItem", "ComboBox")
+
+# Where export_to_yaml writes when no path is given.
+_DEFAULT_EXPORT_PATH = Path("inspector_export.yaml")
+
+
+@dataclass(slots=True)
+class ElementRecord:
+    """One scanned UI element.
+
+    A slotted record instead of a dict: at tens of thousands of elements per
+    deep scan the per-node memory drops roughly 3x and attribute access is
+    faster. ``screen_name``/``scanned_at`` are only set on scan roots;
+    ``error`` is set instead of the properties when an element could not be
+    read.
+    """
+
+    name: str = ""
+    control_type: str = ""
+    automation_id: str = ""
+    class_name: str = ""
+    path: str = ""
+    depth: int = 0
+    rectangle: dict | None = None
+    children: list[ElementRecord] = field(default_factory=list)
+    screen_name: str = ""
+    scanned_at: str = ""
+    error: str | None = None
+    # Control type -> summary dicts for the whole subtree; built once per
+    # scan root so type queries need no further traversal.
+    by_type: dict[str, list[dict]] | None = None
 
 
 class UIInspector:
@@ -33,13 +76,25 @@ class UIInspector:
         window_class: str | None = None,
         max_depth: int = 4,
         backend: str = "uia",
+        capture_rect: bool = True,
     ) -> None:
         self.window_title = window_title
         self.window_class = window_class
         self.max_depth = max_depth
         self.backend = backend
-        self.elements: dict[str, dict] = {}
+        # Bounding rectangles cost an extra COM round-trip per element; turn
+        # them off for workflows that only need ids/names/paths.
+        self.capture_rect = capture_rect
+        self.elements: dict[str, ElementRecord] = {}
         self.window = None
+        # Memoized scan results keyed on element identity, so repeated scans
+        # of the same object (scan + filter in one session) reuse the tree.
+        # Each entry stores the element itself: that pins the object so its
+        # id cannot be recycled while the entry lives. Cleared on every
+        # fresh screen scan.
+        self._scan_cache: dict[
+            tuple[int, int, str, int], tuple[object, ElementRecord | None]
+        ] = {}
 
     def connect(self, window_pattern: str | None = None) -> bool:
         """Connect to a window by title pattern.
@@ -82,127 +137,298 @@ class UIInspector:
                 print("\nSpecify --title to connect to a window.")
             return False
 
-    def scan_element(self, element: object, depth: int = 0, parent_path: str = "") -> dict:
-        """Recursively scan an element and its children."""
+    def scan_element(
+        self, element: object, depth: int = 0, parent_path: str = ""
+    ) -> ElementRecord | None:
+        """Scan an element and its children.
+
+        When the element is backed by a real UIA COM element, all properties
+        for the whole subtree are batched into a single cache request (one
+        cross-process call instead of ~6 per element). Otherwise falls back
+        to per-attribute reads through pywinauto, walking the tree with an
+        explicit stack — no Python frame per node and no recursion limit on
+        deep windows.
+
+        Returns None for elements beyond ``max_depth``; elements that raise
+        while being read come back as a record with ``error`` set. Results
+        are memoized per element object until the next screen scan.
+        """
         if depth > self.max_depth:
-            return {}
+            return None
+
+        cache_key = (id(element), depth, parent_path, self.max_depth)
+        entry = self._scan_cache.get(cache_key)
+        if entry is not None and entry[0] is element:
+            return entry[1]
+
+        record = self._scan_element_uncached(element, depth, parent_path)
+        if record is not None:
+            record.by_type = self._index_by_type(record)
+        self._scan_cache[cache_key] = (element, record)
+        return record
+
+    def _scan_element_uncached(
+        self, element: object, depth: int, parent_path: str
+    ) -> ElementRecord | None:
+        """Walk an element subtree without consulting the scan cache."""
+        if depth == 0:
+            cached = self._scan_element_cached(element, parent_path)
+            if cached is not None:
+                return cached
+
+        # Paths are carried as tuples of interned segments and only joined
+        # into a string when a record is created; repeated segments (Pane,
+        # Button, ...) are then shared across the whole tree.
+        parent_parts = tuple(parent_path.split("/")) if parent_path else ()
+
+        # Hoisted out of the loop: attribute lookups on self/modules cost a
+        # dict probe per access, which adds up over tens of thousands of nodes.
+        max_depth = self.max_depth
+        capture_rect = self.capture_rect
+        intern = sys.intern
+
+        root: ElementRecord | None = None
+        stack: list[tuple[object, int, tuple[str, ...], ElementRecord | None]] = [
+            (element, depth, parent_parts, None)
+        ]
+        while stack:
+            elem, level, parts, parent = stack.pop()
+            if level > max_depth:
+                continue
 
-        try:
-            info = element.element_info  # type: ignore[attr-defined]
-            name = info.name or ""
-            control_type = info.control_type or ""
-            automation_id = info.automation_id or ""
-            class_name = info.class_name or ""
+            try:
+                info = elem.element_info  # type: ignore[attr-defined]
+                # Let pywinauto reuse already-read values instead of re-hitting COM.
+                with contextlib.suppress(AttributeError):
+                    info.set_cache_strategy(cached=True)
+                name = info.name or ""
+                control_type = info.control_type or ""
+                automation_id = info.automation_id or ""
+                class_name = info.class_name or ""
+            except Exception as e:
+                # Any failure reading one element becomes an error record;
+                # live windows raise assorted pywinauto errors when elements
+                # vanish mid-scan and none of them should abort the walk.
+                record = ElementRecord(depth=level, error=str(e))
+                if parent is None:
+                    root = record
+                else:
+                    parent.children.append(record)
+                continue
 
-            path_segment = automation_id or name or control_type
-            current_path = f"{parent_path}/{path_segment}" if parent_path else path_segment
+            current_parts = parts + (intern(automation_id or name or control_type),)
+            current_path = "/".join(current_parts)
+
+            rect_info = None
+            if capture_rect:
+                try:
+                    rect = elem.rectangle()  # type: ignore[attr-defined]
+                    rect_info = {
+                        "left": rect.left,
+                        "top": rect.top,
+                        "width": rect.width(),
+                        "height": rect.height(),
+                    }
+                except Exception:
+                    rect_info = None
+
+            record = ElementRecord(
+                name=name,
+                control_type=control_type,
+                automation_id=automation_id,
+                class_name=class_name,
+                path=current_path,
+                depth=level,
+                rectangle=rect_info,
+            )
 
-            try:
-                rect = element.rectangle()  # type: ignore[attr-defined]
-                rect_info = {
-                    "left": rect.left,
-                    "top": rect.top,
-                    "width": rect.width(),
-                    "height": rect.height(),
-                }
-            except Exception:
-                rect_info = None
-
-            result: dict = {
-                "name": name,
-                "control_type": control_type,
-                "automation_id": automation_id,
-                "class_name": class_name,
-                "path": current_path,
-                "depth": depth,
-                "rectangle": rect_info,
-                "children": [],
-            }
+            if parent is None:
+                root = record
+            else:
+                parent.children.append(record)
 
             try:
-                for child in element.children():  # type: ignore[attr-defined]
-                    child_info = self.scan_element(child, depth + 1, current_path)
-                    if child_info:
-                        result["children"].append(child_info)
+                children = list(_uia.iter_children(elem))
             except Exception:
-                pass
+                # Elements vanishing mid-scan raise assorted pywinauto
+                # errors; skip this node's children, not the whole scan.
+                children = []
+
+            # Reversed so children end up in original (left-to-right) order.
+            stack.extend((child, level + 1, current_parts, record) for child in reversed(children))
 
-            return result
+        return root
 
-        except Exception as e:
-            return {"error": str(e), "depth": depth}
+    def _scan_element_cached(self, element: object, parent_path: str = "") -> ElementRecord | None:
+        """Scan a subtree through one UIA cache request, or None if unavailable."""
+        raw = _uia.get_raw_element(element)
+        if raw is None:
+            return None
+
+        try:
+            cached_root = raw.BuildUpdatedCache(_uia.build_cache_request(self.capture_rect))
+            return self._walk_cached(cached_root, 0, parent_path)
+        except Exception:
+            return None
+
+    def _walk_cached(
+        self, cached_root: object, depth: int, parent_path: str
+    ) -> ElementRecord | None:
+        """Build element records from cached properties (no COM round-trips).
+
+        The whole subtree was materialized in-process by one
+        ``BuildUpdatedCache(TreeScope_Subtree)`` call, so this is a plain
+        Python stack walk; ``max_depth`` is enforced here since the cache
+        request has no depth limit.
+        """
+        parent_parts = tuple(parent_path.split("/")) if parent_path else ()
+
+        max_depth = self.max_depth
+        capture_rect = self.capture_rect
+        intern = sys.intern
+
+        root: ElementRecord | None = None
+        stack: list[tuple[object, int, tuple[str, ...], ElementRecord | None]] = [
+            (cached_root, depth, parent_parts, None)
+        ]
+        while stack:
+            cached_elem, level, parts, parent = stack.pop()
+            if level > max_depth:
+                continue
+
+            name = _uia.cached_name(cached_elem)
+            control_type = _uia.cached_control_type(cached_elem)
+            automation_id = _uia.cached_automation_id(cached_elem)
+
+            current_parts = parts + (intern(automation_id or name or control_type),)
+            current_path = "/".join(current_parts)
+
+            record = ElementRecord(
+                name=name,
+                control_type=control_type,
+                automation_id=automation_id,
+                class_name=_uia.cached_class_name(cached_elem),
+                path=current_path,
+                depth=level,
+                rectangle=_uia.cached_rectangle(cached_elem) if capture_rect else None,
+            )
+
+            if parent is None:
+                root = record
+            else:
+                parent.children.append(record)
 
-    def scan_current_screen(self, screen_name: str = "main") -> dict:
+            # Reversed so children end up in original (left-to-right) order.
+            stack.extend(
+                (child, level + 1, current_parts, record)
+                for child in reversed(_uia.cached_children(cached_elem))
+            )
+
+        return root
+
+    def scan_current_screen(self, screen_name: str = "main") -> ElementRecord:
         """Scan all elements on the current screen."""
         print(f"\n[Scanning] {screen_name} (depth={self.max_depth})...")
         print("           This may take a moment...")
 
+        # A fresh scan must see current window state, not memoized subtrees.
+        self._scan_cache.clear()
         result = self.scan_element(self.window)
-        result["screen_name"] = screen_name
-        result["scanned_at"] = datetime.now().isoformat()
+        if result is None:
+            result = ElementRecord()
+        result.screen_name = screen_name
+        result.scanned_at = datetime.now().isoformat()
 
         self.elements[screen_name] = result
         return result
 
-    def print_element_tree(self, element: dict, indent: int = 0, max_print_depth: int = 3) -> None:
-        """Print element tree in a readable format."""
-        if indent > max_print_depth * 2:
-            return
-
-        prefix = "  " * indent
-        name = element.get("name", "")
-        ctrl_type = element.get("control_type", "")
-        auto_id = element.get("automation_id", "")
-
-        if name or auto_id or ctrl_type in ["Button", "Edit", "MenuItem", "TabItem", "ComboBox"]:
-            line = f"{prefix}[{ctrl_type}]"
-            if name:
-                line += f" '{name}'"
-            if auto_id:
-                line += f" (ID: {auto_id})"
-            print(line)
-
-        for child in element.get("children", []):
-            self.print_element_tree(child, indent + 1, max_print_depth)
-
-    def find_elements_by_type(
-        self, element: dict, control_type: str, results: list[dict] | None = None
-    ) -> list[dict]:
-        """Find all elements of a specific control type."""
-        if results is None:
-            results = []
-
-        if element.get("control_type") == control_type:
-            results.append(
-                {
-                    "name": element.get("name", ""),
-                    "automation_id": element.get("automation_id", ""),
-                    "path": element.get("path", ""),
-                    "rectangle": element.get("rectangle"),
-                }
-            )
+    def print_element_tree(
+        self, element: ElementRecord, indent: int = 0, max_print_depth: int = 3
+    ) -> None:
+        """Print element tree in a readable format.
 
-        for child in element.get("children", []):
-            self.find_elements_by_type(child, control_type, results)
+        The whole tree is formatted into a buffer and flushed with a single
+        write — one print() per element is thousands of syscalls on a large
+        tree.
+        """
+        lines: list[str] = []
+        self._format_tree(element, indent, lines, max_print_depth)
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+
+    def _format_tree(
+        self, element: ElementRecord, indent: int, lines: list[str], max_print_depth: int
+    ) -> None:
+        """Append one formatted line per notable element to ``lines``."""
+        stack = [(element, indent)]
+        while stack:
+            elem, level = stack.pop()
+            if level > max_print_depth * 2:
+                continue
+
+            name = elem.name
+            ctrl_type = elem.control_type
+            auto_id = elem.automation_id
+
+            if name or auto_id or ctrl_type in _KEY_CONTROL_TYPES:
+                line = f"{'  ' * level}[{ctrl_type}]"
+                if name:
+                    line += f" '{name}'"
+                if auto_id:
+                    line += f" (ID: {auto_id})"
+                lines.append(line)
+
+            # Reversed so children print in original (left-to-right) order.
+            stack.extend((child, level + 1) for child in reversed(elem.children))
+
+    @staticmethod
+    def _summarize(element: ElementRecord) -> dict:
+        """Flatten a record to the export dict shape."""
+        return {
+            "name": element.name,
+            "automation_id": element.automation_id,
+            "path": element.path,
+            "rectangle": element.rectangle,
+        }
 
+    def _index_by_type(self, root: ElementRecord) -> dict[str, list[dict]]:
+        """Bucket every element in the tree by control type in one walk."""
+        buckets: dict[str, list[dict]] = defaultdict(list)
+        stack = [root]
+        while stack:
+            elem = stack.pop()
+            buckets[elem.control_type or "Unknown"].append(self._summarize(elem))
+            stack.extend(reversed(elem.children))
+        return buckets
+
+    def find_elements_by_type(self, element: ElementRecord, control_type: str) -> list[dict]:
+        """Find all elements of a specific control type.
+
+        Returns plain dicts (name/automation_id/path/rectangle) ready for
+        export. Scan roots carry a prebuilt type index, making this a dict
+        lookup; subtree records without one are walked.
+        """
+        if element.by_type is not None:
+            return element.by_type.get(control_type, [])
+
+        results: list[dict] = []
+        stack = [element]
+        while stack:
+            elem = stack.pop()
+            if elem.control_type == control_type:
+                results.append(self._summarize(elem))
+            stack.extend(reversed(elem.children))
         return results
 
-    def print_summary(self, screen_data: dict) -> None:
+    def print_summary(self, screen_data: ElementRecord) -> None:
         """Print a summary of discovered elements."""
         print("\n" + "-" * 70)
         print("ELEMENT SUMMARY")
         print("-" * 70)
 
-        type_counts: dict[str, int] = {}
-
-        def count_types(elem: dict) -> None:
-            ctrl_type = elem.get("control_type", "Unknown")
-            type_counts[ctrl_type] = type_counts.get(ctrl_type, 0) + 1
-            for child in elem.get("children", []):
-                count_types(child)
-
-        count_types(screen_data)
+        buckets = screen_data.by_type or self._index_by_type(screen_data)
 
+        type_counts = {ctrl_type: len(items) for ctrl_type, items in buckets.items()}
         for ctrl_type, count in sorted(type_counts.items(), key=lambda x: -x[1]):
             if count > 0:
                 print(f"  {ctrl_type}: {count}")
@@ -211,8 +437,8 @@ class UIInspector:
         print("KEY ELEMENTS")
         print("-" * 70)
 
-        for ctrl_type in ["Button", "Edit", "MenuItem", "TabItem", "ComboBox"]:
-            elements = self.find_elements_by_type(screen_data, ctrl_type)
+        for ctrl_type in _KEY_CONTROL_TYPES:
+            elements = buckets.get(ctrl_type, [])
             if elements:
                 print(f"\n[{ctrl_type}] ({len(elements)} found)")
                 for elem in elements[:10]:
@@ -220,10 +446,18 @@ class UIInspector:
                     auto_id = elem["automation_id"] or "(no id)"
                     print(f"  - Name: '{name}' | ID: {auto_id}")
 
-    def export_to_yaml(self, output_path: str | Path | None = None) -> Path:
-        """Export discovered elements to YAML file."""
+    def export_to_yaml(self, output_path: str | Path | None = None, fast: bool = False) -> Path:
+        """Export discovered elements to YAML file.
+
+        Args:
+            output_path: Destination file (default: inspector_export.yaml).
+            fast: Emit JSON instead of YAML-style output. JSON is a YAML
+                subset, so the file stays loadable by any YAML parser, and
+                serialization is an order of magnitude faster on big scans
+                (orjson is used when installed).
+        """
         if output_path is None:
-            output_path = Path("inspector_export.yaml")
+            output_path = _DEFAULT_EXPORT_PATH
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -235,19 +469,45 @@ class UIInspector:
         }
 
         for screen_name, screen_data in self.elements.items():
+            buckets = screen_data.by_type or self._index_by_type(screen_data)
             export_data["screens"][screen_name] = {
-                "scanned_at": screen_data.get("scanned_at"),
+                "scanned_at": screen_data.scanned_at,
                 "elements": {
-                    "buttons": self.find_elements_by_type(screen_data, "Button"),
-                    "text_fields": self.find_elements_by_type(screen_data, "Edit"),
-                    "menu_items": self.find_elements_by_type(screen_data, "MenuItem"),
-                    "tabs": self.find_elements_by_type(screen_data, "TabItem"),
-                    "combo_boxes": self.find_elements_by_type(screen_data, "ComboBox"),
+                    "buttons": buckets.get("Button", []),
+                    "text_fields": buckets.get("Edit", []),
+                    "menu_items": buckets.get("MenuItem", []),
+                    "tabs": buckets.get("TabItem", []),
+                    "combo_boxes": buckets.get("ComboBox", []),
                 },
             }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.dump(export_data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+        if fast:
+            try:
+                import orjson
+
+                output_path.write_bytes(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
+            except ImportError:
+                import json
+
+                output_path.write_text(
+                    json.dumps(export_data, ensure_ascii=False, indent=2), encoding="utf-8"
+                )
+        else:
+            # Deferred import: only the export path needs yaml. The
+            # libyaml-backed dumper is ~7-8x faster than the pure-Python one.
+            import yaml
+
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+            with open(output_path, "w", encoding="utf-8") as f:
+                yaml.dump(
+                    export_data,
+                    f,
+                    Dumper=dumper,
+                    allow_unicode=True,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
 
         print(f"\n[OK] Exported to: {output_path}")
         return output_path
@@ -265,7 +525,7 @@ class UIInspector:
         print(f"  depth N      - Set scan depth (current: {self.max_depth})")
         print("  quit         - Exit")
 
-        last_scan: dict | None = None
+        last_scan: ElementRecord | None = None
 
         while True:
             try:
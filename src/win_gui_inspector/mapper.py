@@ -7,21 +7,66 @@ Uses pywinauto Desktop(backend="uia") to discover windows by title pattern.
 from __future__ import annotations
 
 import contextlib
-import io
+import functools
 import json
+import re
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from pywinauto import Application, Desktop
+from pywinauto import Desktop
 
+from win_gui_inspector import _uia
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional 'fast' extra
+    orjson = None  # type: ignore[assignment]
+
+
+def _dump_json(obj: object) -> str:
+    """Serialize one export fragment, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+
+@functools.cache
 def _ensure_utf8_output() -> None:
-    """Force UTF-8 output for non-ASCII text on Windows."""
-    if hasattr(sys.stdout, "buffer"):
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    if hasattr(sys.stderr, "buffer"):
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+    """Force UTF-8 output for non-ASCII text on Windows.
+
+    reconfigure() keeps the existing stream object (and its line buffering)
+    instead of wrapping it in a fresh TextIOWrapper. Cached so repeated
+    runs reconfigure the streams only once per process.
+    """
+    for stream in (sys.stdout, sys.stderr):
+        reconfigure = getattr(stream, "reconfigure", None)
+        if reconfigure is not None:
+            reconfigure(encoding="utf-8", errors="replace")
+
+
+# Control types worth reporting; everything else is traversed but not stored.
+_USEFUL_TYPES = frozenset(
+    {
+        "Button",
+        "Edit",
+        "CheckBox",
+        "ComboBox",
+        "List",
+        "ListItem",
+        "DataGrid",
+        "DataItem",
+        "Tab",
+        "TabItem",
+        "RadioButton",
+        "Text",
+        "Table",
+        "TreeItem",
+        "MenuItem",
+    }
+)
 
 
 class WindowMapper:
@@ -38,19 +83,24 @@ class WindowMapper:
         self.class_name = class_name
         self.max_depth = max_depth
         self.backend = backend
+        # Compiled once here; pywinauto recompiles a string pattern on
+        # every windows() call, a compiled object is used as-is.
+        self._title_re = re.compile(title_pattern) if title_pattern else None
 
     def find_windows(self) -> list[dict]:
         """Find all matching windows.
 
         Returns:
-            List of dicts with 'title', 'handle', 'width', 'height' keys.
+            List of dicts with 'title', 'handle', 'width', 'height' and
+            'wrapper' keys; 'wrapper' is the already-enumerated pywinauto
+            window, reused by run() to avoid a fresh COM connect per window.
         """
         desktop = Desktop(backend=self.backend)
         windows_info: list[dict] = []
 
         try:
-            if self.title_pattern:
-                all_windows = desktop.windows(title_re=self.title_pattern)
+            if self._title_re is not None:
+                all_windows = desktop.windows(title_re=self._title_re)
             else:
                 all_windows = desktop.windows()
         except Exception:
@@ -74,6 +124,7 @@ class WindowMapper:
                             "handle": win.handle,
                             "width": width,
                             "height": height,
+                            "wrapper": win,
                         }
                     )
             except Exception:
@@ -81,74 +132,136 @@ class WindowMapper:
 
         return windows_info
 
-    def map_window_elements(self, window: object) -> list[dict]:
+    def map_window_elements(self, window: object) -> dict[str, list[dict]]:
         """Map all UI elements in a window recursively.
 
         Args:
             window: A pywinauto WindowSpecification object.
 
         Returns:
-            List of element info dicts.
+            Dict of control type -> list of element info dicts, grouped as
+            they are discovered.
         """
-        elements: list[dict] = []
-
-        useful_types = {
-            "Button", "Edit", "CheckBox", "ComboBox", "List", "ListItem",
-            "DataGrid", "DataItem", "Tab", "TabItem", "RadioButton",
-            "Text", "Table", "TreeItem", "MenuItem",
-        }
+        by_type: defaultdict[str, list[dict]] = defaultdict(list)
+        # Dedupe identical (id, name) pairs per control type at scan time so
+        # duplicates never reach the output or the export.
+        seen: dict[str, set[tuple[str, str]]] = {}
 
         def scan_element(elem: object, depth: int = 0) -> None:
             if depth > self.max_depth:
                 return
 
+            # Each node is isolated: a dead element (vanished mid-scan,
+            # COM failure) is skipped without discarding its siblings or
+            # aborting the window.
             try:
                 info = elem.element_info  # type: ignore[attr-defined]
+                # Let pywinauto reuse already-read values instead of re-hitting COM.
+                with contextlib.suppress(AttributeError):
+                    info.set_cache_strategy(cached=True)
                 name = info.name or ""
                 ctrl_type = info.control_type or ""
                 auto_id = info.automation_id or ""
-                class_name = info.class_name or ""
 
-                value = ""
-                if ctrl_type == "Edit":
-                    with contextlib.suppress(Exception):
-                        value = elem.legacy_properties().get("Value", "")  # type: ignore[attr-defined]
+                # Only elements that pass the cheap filter pay for the extra
+                # COM calls (class name, legacy value, toggle state).
+                if ctrl_type in _USEFUL_TYPES and (auto_id or name):
+                    key = (auto_id, name)
+                    type_seen = seen.setdefault(ctrl_type, set())
+                    if key not in type_seen:
+                        type_seen.add(key)
+
+                        element_info: dict = {
+                            "depth": depth,
+                            "type": ctrl_type,
+                            "id": auto_id,
+                            "name": name,
+                            "class": info.class_name or "",
+                        }
 
-                checked = None
-                if ctrl_type == "CheckBox":
-                    with contextlib.suppress(Exception):
-                        checked = elem.get_toggle_state()  # type: ignore[attr-defined]
+                        if ctrl_type == "Edit":
+                            with contextlib.suppress(Exception):
+                                value = elem.legacy_properties().get("Value", "")  # type: ignore[attr-defined]
+                                if value:
+                                    element_info["value"] = value
+                        elif ctrl_type == "CheckBox":
+                            checked = None
+                            with contextlib.suppress(Exception):
+                                checked = elem.get_toggle_state()  # type: ignore[attr-defined]
+                            if checked is not None:
+                                element_info["checked"] = checked
+
+                        by_type[ctrl_type].append(element_info)
+            except Exception:
+                return
 
-                element_info: dict = {
-                    "depth": depth,
-                    "type": ctrl_type,
-                    "id": auto_id,
-                    "name": name,
-                    "class": class_name,
-                }
+            try:
+                children = list(_uia.iter_children(elem))
+            except Exception:
+                children = []
 
-                if value:
-                    element_info["value"] = value
-                if checked is not None:
-                    element_info["checked"] = checked
+            # Recursion happens outside the node's handler so a failure in
+            # one child cannot unwind through the parent.
+            for child in children:
+                scan_element(child, depth + 1)
 
-                if ctrl_type in useful_types and (auto_id or name):
-                    elements.append(element_info)
+        scan_element(window)
+        return dict(by_type)
 
-                for child in elem.children():  # type: ignore[attr-defined]
-                    scan_element(child, depth + 1)
+    def _map_one(self, win: dict, quiet: bool, mapped_at: str) -> tuple[dict | None, str]:
+        """Map a single window; worker body for the thread pool in run().
 
-            except Exception:
-                pass
+        Returns (mapping, buffered console output); mapping is None when the
+        window could not be mapped. COM is initialized per worker thread and
+        output is buffered so printing stays serialized in run().
+        """
+        _uia.co_initialize()
+        try:
+            by_type = self.map_window_elements(win["wrapper"])
+            element_count = sum(len(items) for items in by_type.values())
 
-        scan_element(window)
-        return elements
+            output = ""
+            if not quiet:
+                # Buffer the listing and flush it in one write instead of
+                # one syscall per element.
+                lines = [f"\nFound {element_count} elements:"]
+
+                for ctrl_type, items in sorted(by_type.items()):
+                    lines.append(f"\n  === {ctrl_type} ({len(items)}) ===")
+
+                    for elem in items:
+                        id_str = elem.get("id") or "-"
+                        name_str = elem.get("name") or "(no name)"
+                        value_str = f" value=[{elem['value']}]" if elem.get("value") else ""
+                        checked_str = (
+                            f" checked={elem['checked']}"
+                            if elem.get("checked") is not None
+                            else ""
+                        )
+
+                        lines.append(f"    [{id_str:>5}] {name_str[:50]}{value_str}{checked_str}")
+
+                output = "\n".join(lines) + "\n"
 
-    def run(self, export_path: str | Path | None = None) -> dict[str, dict]:
+            mapping = {
+                "size": f"{win['width']}x{win['height']}",
+                "elements": by_type,
+                "mapped_at": mapped_at,
+            }
+            return mapping, output
+
+        except Exception as e:
+            return None, f"  Error: {e}\n"
+        finally:
+            _uia.co_uninitialize()
+
+    def run(self, export_path: str | Path | None = None, quiet: bool = False) -> dict[str, dict]:
         """Run the full mapping process.
 
         Args:
             export_path: Optional JSON file path for export.
+            quiet: Skip the per-element console listing (mapping summary
+                lines are still printed).
 
         Returns:
             Dict of window_title -> mapping data.
@@ -171,68 +284,54 @@ class WindowMapper:
 
         all_mappings: dict[str, dict] = {}
 
-        for win in windows:
-            title = win["title"]
-            print("\n" + "=" * 70)
-            print(f"MAPPING: {title}")
-            print("=" * 70)
-
-            try:
-                app = Application(backend=self.backend).connect(handle=win["handle"])
-                window = app.window(handle=win["handle"])
-
-                elements = self.map_window_elements(window)
-
-                # Group by control type
-                by_type: dict[str, list[dict]] = {}
-                for elem in elements:
-                    t = elem["type"]
-                    if t not in by_type:
-                        by_type[t] = []
-                    by_type[t].append(elem)
-
-                print(f"\nFound {len(elements)} elements:")
-
-                for ctrl_type in sorted(by_type.keys()):
-                    items = by_type[ctrl_type]
-                    print(f"\n  === {ctrl_type} ({len(items)}) ===")
-
-                    seen: set[tuple[str, str]] = set()
-                    for elem in items:
-                        key = (elem.get("id", ""), elem.get("name", ""))
-                        if key in seen:
-                            continue
-                        seen.add(key)
-
-                        id_str = elem.get("id") or "-"
-                        name_str = elem.get("name") or "(no name)"
-                        value_str = f" value=[{elem['value']}]" if elem.get("value") else ""
-                        checked_str = (
-                            f" checked={elem['checked']}"
-                            if elem.get("checked") is not None
-                            else ""
-                        )
-
-                        print(f"    [{id_str:>5}] {name_str[:50]}{value_str}{checked_str}")
-
-                all_mappings[title] = {
-                    "size": f"{win['width']}x{win['height']}",
-                    "elements": elements,
-                    "mapped_at": datetime.now().isoformat(),
-                }
-
-            except Exception as e:
-                print(f"  Error: {e}")
-
-        # Export to JSON if requested
+        # Stream each window's mapping to the export file as it is produced,
+        # instead of serializing the whole structure in one final pass.
+        export_file = None
+        first_entry = True
         if export_path:
             export_path = Path(export_path)
             try:
-                with open(export_path, "w", encoding="utf-8") as f:
-                    json.dump(all_mappings, f, ensure_ascii=False, indent=2)
-                print(f"\n\nSaved element map to: {export_path}")
+                # Held open across the mapping loop for streaming; closed below.
+                export_file = open(export_path, "w", encoding="utf-8")  # noqa: SIM115
+                export_file.write("{\n")
             except Exception as e:
                 print(f"\nError saving: {e}")
+                export_file = None
+
+        # Each window's mapping is independently COM-bound (the GIL is
+        # released while UIA calls block on the target process), so map the
+        # windows on a thread pool. Results are consumed in submission order
+        # to keep console output and the streamed export deterministic.
+        # One timestamp per run; no need to re-format the clock per window.
+        now_iso = datetime.now().isoformat()
+
+        with ThreadPoolExecutor(max_workers=min(8, len(windows))) as pool:
+            futures = [(win, pool.submit(self._map_one, win, quiet, now_iso)) for win in windows]
+
+            for win, future in futures:
+                title = win["title"]
+                print("\n" + "=" * 70)
+                print(f"MAPPING: {title}")
+                print("=" * 70)
+
+                mapping, output = future.result()
+                if output:
+                    sys.stdout.write(output)
+                if mapping is None:
+                    continue
+
+                all_mappings[title] = mapping
+
+                if export_file:
+                    if not first_entry:
+                        export_file.write(",\n")
+                    export_file.write(_dump_json(title) + ": " + _dump_json(mapping))
+                    first_entry = False
+
+        if export_file:
+            export_file.write("\n}\n")
+            export_file.close()
+            print(f"\n\nSaved element map to: {export_path}")
 
         print("\n" + "=" * 70)
         print("MAPPING COMPLETE")
@@ -5,11 +5,94 @@ Provides mock pywinauto objects for testing without a live Windows desktop.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, PropertyMock
+import copy
+from dataclasses import dataclass, field
+from unittest.mock import patch
 
 import pytest
 
 
+@pytest.fixture(autouse=True, scope="session")
+def no_blocking_waits():
+    """Neutralize real delays for the whole session.
+
+    Nothing under test should sleep, but pywinauto threads waits through its
+    connect and enumeration paths; patching time.sleep and switching its
+    global timings to the fast profile keeps any stray code path from
+    stalling the suite.
+    """
+    with patch("time.sleep"):
+        try:
+            from pywinauto import timings
+
+            timings.Timings.fast()
+        except Exception:
+            pass
+        yield
+
+
+@dataclass(frozen=True, slots=True)
+class FakeRect:
+    """Stand-in for a pywinauto rectangle (attrs + width()/height())."""
+
+    left: int
+    top: int
+    _width: int
+    _height: int
+
+    def width(self) -> int:
+        return self._width
+
+    def height(self) -> int:
+        return self._height
+
+
+@dataclass(frozen=True, slots=True)
+class FakeElementInfo:
+    """Stand-in for pywinauto's element_info property bag."""
+
+    name: str = ""
+    control_type: str = ""
+    automation_id: str = ""
+    class_name: str = ""
+
+
+@dataclass(slots=True)
+class FakeElement:
+    """Stand-in for a pywinauto element wrapper.
+
+    Slotted dataclasses instead of mocks or namespaces: attribute access is
+    a fixed-offset load and a node costs a few hundred bytes rather than a
+    MagicMock plus its per-attribute child mocks.
+    """
+
+    element_info: FakeElementInfo
+    handle: int = 12345
+    _rect: FakeRect | None = None
+    _children: list[FakeElement] = field(default_factory=list)
+    _value: str = ""
+    _toggle_state: int | None = None
+
+    def window_text(self) -> str:
+        return self.element_info.name
+
+    def rectangle(self) -> FakeRect:
+        if self._rect is None:
+            raise Exception("No rect")
+        return self._rect
+
+    def children(self) -> list[FakeElement]:
+        return self._children
+
+    def legacy_properties(self) -> dict:
+        return {"Value": self._value} if self._value else {}
+
+    def get_toggle_state(self) -> int:
+        if self._toggle_state is None:
+            raise Exception("Not a checkbox")
+        return self._toggle_state
+
+
 def make_mock_element(
     name: str = "",
     control_type: str = "",
@@ -19,65 +102,35 @@ def make_mock_element(
     rect: tuple[int, int, int, int] | None = (0, 0, 100, 50),
     value: str = "",
     toggle_state: int | None = None,
-) -> MagicMock:
-    """Create a mock pywinauto element with element_info.
+) -> FakeElement:
+    """Create a fake pywinauto element with element_info.
 
     Args:
         name: Element name.
         control_type: UIA control type (e.g., "Button", "Edit").
         automation_id: UIA automation ID.
         class_name: Window class name.
-        children: List of child mock elements.
+        children: List of child fake elements.
         rect: (left, top, width, height) or None.
         value: Value for Edit controls (legacy_properties).
         toggle_state: Toggle state for CheckBox controls.
     """
-    elem = MagicMock()
-
-    # element_info properties
-    info = MagicMock()
-    info.name = name
-    info.control_type = control_type
-    info.automation_id = automation_id
-    info.class_name = class_name
-    elem.element_info = info
-
-    # Rectangle
-    if rect:
-        mock_rect = MagicMock()
-        mock_rect.left = rect[0]
-        mock_rect.top = rect[1]
-        mock_rect.width.return_value = rect[2]
-        mock_rect.height.return_value = rect[3]
-        elem.rectangle.return_value = mock_rect
-    else:
-        elem.rectangle.side_effect = Exception("No rect")
-
-    # Children
-    elem.children.return_value = children or []
-
-    # Edit value
-    if value:
-        elem.legacy_properties.return_value = {"Value": value}
-    else:
-        elem.legacy_properties.return_value = {}
-
-    # CheckBox toggle
-    if toggle_state is not None:
-        elem.get_toggle_state.return_value = toggle_state
-    else:
-        elem.get_toggle_state.side_effect = Exception("Not a checkbox")
-
-    # Window text (for window-level elements)
-    elem.window_text.return_value = name
-    type(elem).handle = PropertyMock(return_value=12345)
-
-    return elem
+    return FakeElement(
+        element_info=FakeElementInfo(
+            name=name,
+            control_type=control_type,
+            automation_id=automation_id,
+            class_name=class_name,
+        ),
+        _rect=FakeRect(rect[0], rect[1], rect[2], rect[3]) if rect else None,
+        _children=list(children or []),
+        _value=value,
+        _toggle_state=toggle_state,
+    )
 
 
-@pytest.fixture
-def mock_window():
-    """A mock window with a small element tree."""
+def _build_mock_window() -> FakeElement:
+    """Build the standard mock window tree used by the fixtures below."""
     buy_btn = make_mock_element(
         name="Buy",
         control_type="Button",
@@ -123,6 +176,55 @@ def mock_window():
     return window
 
 
+# Built once; constructing the full fake tree is the expensive part.
+_MOCK_WINDOW_TEMPLATE = _build_mock_window()
+
+
+@pytest.fixture(scope="session")
+def mock_window():
+    """A mock window with a small element tree.
+
+    Session-scoped: tests only read the tree (mutation happens on the
+    inspector/mapper objects, never on the window), so one instance is
+    shared instead of a deepcopy per test.
+    """
+    return _MOCK_WINDOW_TEMPLATE
+
+
+@pytest.fixture(scope="class")
+def scanned_tree():
+    """A scanned element tree shared across a test class.
+
+    Scanning the mock tree is O(nodes) per call; tests that only read the
+    result share one traversal.
+    """
+    from win_gui_inspector.inspector import UIInspector
+
+    return UIInspector(max_depth=4).scan_element(copy.deepcopy(_MOCK_WINDOW_TEMPLATE))
+
+
+@pytest.fixture(scope="session")
+def exported_yaml_data(tmp_path_factory):
+    """Parsed YAML from a single scan + export, shared across export tests.
+
+    Scanning and re-parsing the export per test repeats the most expensive
+    part of the suite; the tests only read the resulting dict.
+    """
+    import yaml
+
+    from win_gui_inspector.inspector import UIInspector
+
+    inspector = UIInspector(max_depth=4)
+    inspector.window = _build_mock_window()
+    inspector.scan_current_screen("test_screen")
+
+    output = tmp_path_factory.mktemp("export") / "export.yaml"
+    inspector.export_to_yaml(output)
+
+    with open(output, encoding="utf-8") as f:
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
 @pytest.fixture
 def mock_tiny_window():
     """A tiny window that should be filtered out by the mapper."""
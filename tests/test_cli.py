@@ -2,121 +2,197 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import sys
+from contextlib import ExitStack
+from unittest.mock import patch
 
-from win_gui_inspector.cli import cmd_inspect, cmd_map, main, parse_args
+import pytest
+
+
+@pytest.fixture(scope="module")
+def cli():
+    """Import the CLI module once per test module, not at collection time."""
+    import win_gui_inspector.cli as module
+
+    return module
+
+
+@pytest.fixture
+def set_argv(monkeypatch):
+    """Set sys.argv for a test without the mock.patch enter/exit overhead."""
+
+    def _set(argv: list[str]) -> None:
+        monkeypatch.setattr(sys, "argv", argv)
+
+    return _set
 
 
 class TestParseArgs:
     """Test argument parsing."""
 
-    @patch("sys.argv", ["prog", "inspect", "--title", "Test"])
-    def test_inspect_defaults(self):
-        args = parse_args()
-        assert args.command == "inspect"
-        assert args.title == "Test"
-        assert args.depth == 4
-        assert args.export is False
-        assert args.backend == "uia"
-
-    @patch(
-        "sys.argv",
+    @pytest.mark.parametrize(
+        ("argv", "expected"),
         [
-            "prog",
-            "inspect",
-            "--title",
-            "MyApp",
-            "--depth",
-            "6",
-            "--export",
-            "--screen",
-            "order",
-            "--output",
-            "out.yaml",
+            (
+                ["prog", "inspect", "--title", "Test"],
+                {
+                    "command": "inspect",
+                    "title": "Test",
+                    "depth": 4,
+                    "export": False,
+                    "backend": "uia",
+                },
+            ),
+            (
+                [
+                    "prog",
+                    "inspect",
+                    "--title",
+                    "MyApp",
+                    "--depth",
+                    "6",
+                    "--export",
+                    "--screen",
+                    "order",
+                    "--output",
+                    "out.yaml",
+                ],
+                {"depth": 6, "export": True, "screen": "order", "output": "out.yaml"},
+            ),
+            (
+                ["prog", "map", "--title", "Test"],
+                {"command": "map", "title": "Test", "depth": 5, "export": None},
+            ),
+            (
+                ["prog", "map", "--title", "App", "--export", "out.json", "--depth", "3"],
+                {"export": "out.json", "depth": 3},
+            ),
+            (
+                ["prog", "inspect", "--title", "Test", "--no-rect", "--fast"],
+                {"no_rect": True, "fast": True},
+            ),
+            (["prog", "map", "--title", "Test", "--quiet"], {"quiet": True}),
+            (
+                ["prog", "inspect", "--title=MyApp", "--depth=6"],
+                {"title": "MyApp", "depth": 6},
+            ),
+            (["prog", "--version"], {"version": True}),
+        ],
+        ids=[
+            "inspect-defaults",
+            "inspect-all-options",
+            "map-defaults",
+            "map-with-export",
+            "inspect-scan-flags",
+            "map-quiet",
+            "equals-syntax",
+            "version",
         ],
     )
-    def test_inspect_all_options(self):
-        args = parse_args()
-        assert args.depth == 6
-        assert args.export is True
-        assert args.screen == "order"
-        assert args.output == "out.yaml"
-
-    @patch("sys.argv", ["prog", "map", "--title", "Test"])
-    def test_map_defaults(self):
-        args = parse_args()
-        assert args.command == "map"
-        assert args.title == "Test"
-        assert args.depth == 5
-        assert args.export is None
-
-    @patch("sys.argv", ["prog", "map", "--title", "App", "--export", "out.json", "--depth", "3"])
-    def test_map_with_export(self):
-        args = parse_args()
-        assert args.export == "out.json"
-        assert args.depth == 3
-
-    @patch("sys.argv", ["prog", "--version"])
-    def test_version_flag(self):
-        args = parse_args()
-        assert args.version is True
+    def test_parse(self, cli, set_argv, argv, expected):
+        set_argv(argv)
+        args = cli.parse_args()
+        for attr, value in expected.items():
+            assert getattr(args, attr) == value
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["prog", "bogus"],
+            ["prog", "inspect", "--nope"],
+            ["prog", "inspect", "--depth"],
+            ["prog", "inspect", "--depth", "many"],
+            ["prog", "inspect", "--export=now"],
+        ],
+        ids=[
+            "unknown-command",
+            "unknown-option",
+            "missing-value",
+            "bad-value",
+            "flag-with-value",
+        ],
+    )
+    def test_bad_input_exits_2(self, cli, set_argv, argv, capsys):
+        set_argv(argv)
+        with pytest.raises(SystemExit) as exc:
+            cli.parse_args()
+        assert exc.value.code == 2
+        assert "error:" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "argv",
+        [["prog", "--help"], ["prog", "inspect", "--help"], ["prog", "map", "-h"]],
+        ids=["top-level", "after-inspect", "after-map"],
+    )
+    def test_help_exits_0(self, cli, set_argv, argv, capsys):
+        set_argv(argv)
+        with pytest.raises(SystemExit) as exc:
+            cli.parse_args()
+        assert exc.value.code == 0
+        assert "usage:" in capsys.readouterr().out
+
+
+@pytest.fixture
+def patched_inspector():
+    """Patch UIInspector for dispatch tests; the target string is resolved once here."""
+    with ExitStack() as stack:
+        yield stack.enter_context(patch("win_gui_inspector.inspector.UIInspector"))
+
+
+@pytest.fixture
+def patched_mapper():
+    """Patch WindowMapper for dispatch tests."""
+    with ExitStack() as stack:
+        yield stack.enter_context(patch("win_gui_inspector.mapper.WindowMapper"))
 
 
 class TestCmdDispatch:
     """Test command dispatch."""
 
-    @patch("win_gui_inspector.inspector.UIInspector")
-    @patch("sys.argv", ["prog", "inspect", "--title", "Test"])
-    def test_cmd_inspect_interactive(self, mock_inspector_cls):
-        mock_inspector = MagicMock()
+    def test_cmd_inspect_interactive(self, patched_inspector, cli, set_argv):
+        set_argv(["prog", "inspect", "--title", "Test"])
+        mock_inspector = patched_inspector.return_value
         mock_inspector.connect.return_value = True
-        mock_inspector_cls.return_value = mock_inspector
 
-        args = parse_args()
-        result = cmd_inspect(args)
+        args = cli.parse_args()
+        result = cli.cmd_inspect(args)
 
         assert result == 0
         mock_inspector.interactive_mode.assert_called_once()
 
-    @patch("win_gui_inspector.inspector.UIInspector")
-    @patch("sys.argv", ["prog", "inspect", "--title", "Test", "--export"])
-    def test_cmd_inspect_export(self, mock_inspector_cls):
-        mock_inspector = MagicMock()
+    def test_cmd_inspect_export(self, patched_inspector, cli, set_argv):
+        set_argv(["prog", "inspect", "--title", "Test", "--export"])
+        mock_inspector = patched_inspector.return_value
         mock_inspector.connect.return_value = True
-        mock_inspector_cls.return_value = mock_inspector
 
-        args = parse_args()
-        result = cmd_inspect(args)
+        args = cli.parse_args()
+        result = cli.cmd_inspect(args)
 
         assert result == 0
         mock_inspector.scan_current_screen.assert_called_once()
         mock_inspector.export_to_yaml.assert_called_once()
 
-    @patch("win_gui_inspector.inspector.UIInspector")
-    @patch("sys.argv", ["prog", "inspect", "--title", "Test"])
-    def test_cmd_inspect_connect_failure(self, mock_inspector_cls):
-        mock_inspector = MagicMock()
+    def test_cmd_inspect_connect_failure(self, patched_inspector, cli, set_argv):
+        set_argv(["prog", "inspect", "--title", "Test"])
+        mock_inspector = patched_inspector.return_value
         mock_inspector.connect.return_value = False
-        mock_inspector_cls.return_value = mock_inspector
 
-        args = parse_args()
-        result = cmd_inspect(args)
+        args = cli.parse_args()
+        result = cli.cmd_inspect(args)
 
         assert result == 1
 
-    @patch("win_gui_inspector.mapper.WindowMapper")
-    @patch("sys.argv", ["prog", "map", "--title", "Test"])
-    def test_cmd_map(self, mock_mapper_cls):
-        mock_mapper = MagicMock()
-        mock_mapper_cls.return_value = mock_mapper
+    def test_cmd_map(self, patched_mapper, cli, set_argv):
+        set_argv(["prog", "map", "--title", "Test"])
+        mock_mapper = patched_mapper.return_value
 
-        args = parse_args()
-        result = cmd_map(args)
+        args = cli.parse_args()
+        result = cli.cmd_map(args)
 
         assert result == 0
         mock_mapper.run.assert_called_once()
 
-    @patch("sys.argv", ["prog", "--version"])
-    def test_main_version(self):
-        result = main()
+    def test_main_version(self, cli, set_argv):
+        set_argv(["prog", "--version"])
+        result = cli.main()
         assert result == 0
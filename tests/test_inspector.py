@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+from contextlib import ExitStack
 from unittest.mock import MagicMock, patch
 
+import pytest
 import yaml
 
+import win_gui_inspector.inspector as inspector_module
 from win_gui_inspector.inspector import UIInspector
 
 
@@ -17,71 +19,80 @@ class TestScanElement:
         inspector = UIInspector(max_depth=4)
         result = inspector.scan_element(mock_window)
 
-        assert result["name"] == "Test Window"
-        assert result["control_type"] == "Window"
-        assert result["depth"] == 0
-        assert len(result["children"]) == 1  # pane
+        assert result.name == "Test Window"
+        assert result.control_type == "Window"
+        assert result.depth == 0
+        assert len(result.children) == 1  # pane
 
     def test_scan_respects_depth_limit(self, mock_window):
         inspector = UIInspector(max_depth=0)
         result = inspector.scan_element(mock_window)
 
         # At depth 0, the root itself is scanned but children are at depth 1
-        assert result["children"] == []
+        assert result.children == []
 
     def test_scan_builds_paths(self, mock_window):
         inspector = UIInspector(max_depth=4)
         result = inspector.scan_element(mock_window)
 
-        pane = result["children"][0]
-        assert pane["path"] == "Test Window/pane1"
+        pane = result.children[0]
+        assert pane.path == "Test Window/pane1"
 
-        buy = pane["children"][0]
-        assert buy["path"] == "Test Window/pane1/116"
+        buy = pane.children[0]
+        assert buy.path == "Test Window/pane1/116"
 
     def test_scan_includes_rectangle(self, mock_window):
         inspector = UIInspector(max_depth=1)
         result = inspector.scan_element(mock_window)
 
-        assert result["rectangle"]["width"] == 800
-        assert result["rectangle"]["height"] == 600
+        assert result.rectangle["width"] == 800
+        assert result.rectangle["height"] == 600
+
+    def test_scan_without_rect_capture(self, mock_window):
+        inspector = UIInspector(max_depth=1, capture_rect=False)
+        result = inspector.scan_element(mock_window)
+
+        assert result.name == "Test Window"
+        assert result.rectangle is None
+        assert result.children[0].rectangle is None
 
     def test_scan_handles_broken_element(self):
-        """Elements that raise exceptions are handled gracefully."""
-        broken = MagicMock()
-        broken.element_info = property(lambda _: (_ for _ in ()).throw(Exception("broken")))
-        type(broken).element_info = property(lambda _: (_ for _ in ()).throw(Exception("broken")))
+        """Elements that raise while being read are handled gracefully."""
+
+        # A plain object, not a Mock: a property raising AttributeError on a
+        # MagicMock is swallowed by Mock.__getattr__ and never raises.
+        class BrokenElement:
+            @property
+            def element_info(self):
+                raise AttributeError("broken")
 
         inspector = UIInspector(max_depth=2)
-        result = inspector.scan_element(broken)
+        result = inspector.scan_element(BrokenElement())
 
-        assert "error" in result
+        assert result.error == "broken"
 
 
 class TestFindElementsByType:
     """Test element type filtering."""
 
-    def test_find_buttons(self, mock_window):
+    def test_find_buttons(self, scanned_tree):
         inspector = UIInspector(max_depth=4)
-        tree = inspector.scan_element(mock_window)
 
-        buttons = inspector.find_elements_by_type(tree, "Button")
+        buttons = inspector.find_elements_by_type(scanned_tree, "Button")
         assert len(buttons) == 2
         names = {b["name"] for b in buttons}
         assert names == {"Buy", "Sell"}
 
-    def test_find_edits(self, mock_window):
+    def test_find_edits(self, scanned_tree):
         inspector = UIInspector(max_depth=4)
-        tree = inspector.scan_element(mock_window)
 
-        edits = inspector.find_elements_by_type(tree, "Edit")
+        edits = inspector.find_elements_by_type(scanned_tree, "Edit")
         assert len(edits) == 2
 
-    def test_find_nonexistent_type(self, mock_window):
+    def test_find_nonexistent_type(self, scanned_tree):
         inspector = UIInspector(max_depth=4)
-        tree = inspector.scan_element(mock_window)
 
-        menus = inspector.find_elements_by_type(tree, "MenuItem")
+        menus = inspector.find_elements_by_type(scanned_tree, "MenuItem")
         assert menus == []
 
 
@@ -99,49 +110,69 @@ class TestExportToYaml:
         assert result_path == output
         assert output.exists()
 
-    def test_export_yaml_structure(self, mock_window, tmp_path):
+    def test_export_yaml_structure(self, exported_yaml_data):
+        data = exported_yaml_data
+
+        assert data["version"] == "1.0"
+        assert "generated_at" in data
+        assert "test_screen" in data["screens"]
+
+        screen = data["screens"]["test_screen"]
+        assert "buttons" in screen["elements"]
+        assert "text_fields" in screen["elements"]
+        assert len(screen["elements"]["buttons"]) == 2
+
+    def test_export_fast_is_yaml_loadable(self, mock_window, tmp_path):
         inspector = UIInspector(max_depth=4)
         inspector.window = mock_window
         inspector.scan_current_screen("test_screen")
 
         output = tmp_path / "export.yaml"
-        inspector.export_to_yaml(output)
+        inspector.export_to_yaml(output, fast=True)
 
+        # JSON is a YAML subset; the fast export must stay loadable by a
+        # plain YAML parser.
         with open(output, encoding="utf-8") as f:
             data = yaml.safe_load(f)
 
         assert data["version"] == "1.0"
-        assert "generated_at" in data
-        assert "test_screen" in data["screens"]
-
         screen = data["screens"]["test_screen"]
-        assert "buttons" in screen["elements"]
-        assert "text_fields" in screen["elements"]
         assert len(screen["elements"]["buttons"]) == 2
 
     def test_export_default_path(self, mock_window, monkeypatch, tmp_path):
-        monkeypatch.chdir(tmp_path)
+        # Point the default at tmp_path instead of chdir'ing the process.
+        default = tmp_path / "inspector_export.yaml"
+        monkeypatch.setattr(inspector_module, "_DEFAULT_EXPORT_PATH", default)
 
         inspector = UIInspector(max_depth=4)
         inspector.window = mock_window
         inspector.scan_current_screen("main")
 
         result_path = inspector.export_to_yaml()
-        assert result_path == Path("inspector_export.yaml")
+        assert result_path == default
+        assert default.exists()
+
+
+@pytest.fixture
+def patched_desktop():
+    """Patch Desktop for connect tests via one ExitStack.
+
+    _ensure_utf8_output needs no patching: it is cached and a no-op under
+    pytest's capture streams.
+    """
+    with ExitStack() as stack:
+        desktop_cls = stack.enter_context(patch("win_gui_inspector.inspector.Desktop"))
+        yield desktop_cls.return_value
 
 
 class TestConnect:
     """Test window connection."""
 
-    @patch("win_gui_inspector.inspector._ensure_utf8_output")
-    @patch("win_gui_inspector.inspector.Desktop")
-    def test_connect_with_pattern(self, mock_desktop_cls, _mock_utf8):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
+    def test_connect_with_pattern(self, patched_desktop):
         mock_window = MagicMock()
         mock_window.window_text.return_value = "Test App"
         mock_window.handle = 12345
-        mock_desktop.window.return_value = mock_window
+        patched_desktop.window.return_value = mock_window
 
         inspector = UIInspector(window_title="Test")
         result = inspector.connect()
@@ -149,24 +180,16 @@ class TestConnect:
         assert result is True
         assert inspector.window is mock_window
 
-    @patch("win_gui_inspector.inspector._ensure_utf8_output")
-    @patch("win_gui_inspector.inspector.Desktop")
-    def test_connect_no_pattern_lists_windows(self, mock_desktop_cls, _mock_utf8):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-        mock_desktop.windows.return_value = []
+    def test_connect_no_pattern_lists_windows(self, patched_desktop):
+        patched_desktop.windows.return_value = []
 
         inspector = UIInspector()
         result = inspector.connect()
 
         assert result is False
 
-    @patch("win_gui_inspector.inspector._ensure_utf8_output")
-    @patch("win_gui_inspector.inspector.Desktop")
-    def test_connect_pattern_not_found(self, mock_desktop_cls, _mock_utf8):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-        mock_desktop.window.side_effect = Exception("Not found")
+    def test_connect_pattern_not_found(self, patched_desktop):
+        patched_desktop.window.side_effect = Exception("Not found")
 
         inspector = UIInspector(window_title="NonExistent")
         result = inspector.connect()
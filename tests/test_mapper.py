@@ -3,24 +3,34 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
+
+import pytest
 
 from tests.conftest import make_mock_element
 from win_gui_inspector.mapper import WindowMapper
 
 
+@pytest.fixture
+def desktop_mock(monkeypatch):
+    """A mocked Desktop instance wired into the mapper module.
+
+    One place builds the class/instance mock pair instead of every test
+    repeating the patch-and-configure dance.
+    """
+    instance = MagicMock()
+    monkeypatch.setattr("win_gui_inspector.mapper.Desktop", MagicMock(return_value=instance))
+    return instance
+
+
 class TestFindWindows:
     """Test window discovery."""
 
-    @patch("win_gui_inspector.mapper.Desktop")
-    def test_find_windows_returns_visible(self, mock_desktop_cls):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-
+    def test_find_windows_returns_visible(self, desktop_mock):
         win1 = make_mock_element(name="App Window", rect=(0, 0, 800, 600))
         win2 = make_mock_element(name="Dialog", rect=(100, 100, 400, 300))
 
-        mock_desktop.windows.return_value = [win1, win2]
+        desktop_mock.windows.return_value = [win1, win2]
 
         mapper = WindowMapper()
         windows = mapper.find_windows()
@@ -30,15 +40,11 @@ class TestFindWindows:
         assert windows[0]["width"] == 800
         assert windows[1]["title"] == "Dialog"
 
-    @patch("win_gui_inspector.mapper.Desktop")
-    def test_find_windows_filters_tiny(self, mock_desktop_cls):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-
+    def test_find_windows_filters_tiny(self, desktop_mock):
         big = make_mock_element(name="Main", rect=(0, 0, 800, 600))
         tiny = make_mock_element(name="Hidden", rect=(0, 0, 50, 50))
 
-        mock_desktop.windows.return_value = [big, tiny]
+        desktop_mock.windows.return_value = [big, tiny]
 
         mapper = WindowMapper()
         windows = mapper.find_windows()
@@ -46,24 +52,19 @@ class TestFindWindows:
         assert len(windows) == 1
         assert windows[0]["title"] == "Main"
 
-    @patch("win_gui_inspector.mapper.Desktop")
-    def test_find_windows_with_title_pattern(self, mock_desktop_cls):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-        mock_desktop.windows.return_value = []
+    def test_find_windows_with_title_pattern(self, desktop_mock):
+        desktop_mock.windows.return_value = []
 
         mapper = WindowMapper(title_pattern="Order.*")
         mapper.find_windows()
 
-        mock_desktop.windows.assert_called_with(title_re="Order.*")
-
-    @patch("win_gui_inspector.mapper.Desktop")
-    def test_find_windows_skips_untitled(self, mock_desktop_cls):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
+        # The pattern is precompiled once in __init__ and passed as-is.
+        (_, kwargs) = desktop_mock.windows.call_args
+        assert kwargs["title_re"].pattern == "Order.*"
 
+    def test_find_windows_skips_untitled(self, desktop_mock):
         untitled = make_mock_element(name="", rect=(0, 0, 800, 600))
-        mock_desktop.windows.return_value = [untitled]
+        desktop_mock.windows.return_value = [untitled]
 
         mapper = WindowMapper()
         windows = mapper.find_windows()
@@ -76,12 +77,11 @@ class TestMapWindowElements:
 
     def test_extracts_useful_elements(self, mock_window):
         mapper = WindowMapper(max_depth=5)
-        elements = mapper.map_window_elements(mock_window)
+        by_type = mapper.map_window_elements(mock_window)
 
-        types = [e["type"] for e in elements]
-        assert types.count("Button") == 2
-        assert types.count("Edit") == 2
-        assert types.count("CheckBox") == 1
+        assert len(by_type["Button"]) == 2
+        assert len(by_type["Edit"]) == 2
+        assert len(by_type["CheckBox"]) == 1
 
     def test_extracts_edit_values(self):
         edit = make_mock_element(
@@ -97,9 +97,9 @@ class TestMapWindowElements:
         )
 
         mapper = WindowMapper(max_depth=2)
-        elements = mapper.map_window_elements(window)
+        by_type = mapper.map_window_elements(window)
 
-        price_elem = next(e for e in elements if e["name"] == "Price")
+        price_elem = next(e for e in by_type["Edit"] if e["name"] == "Price")
         assert price_elem["value"] == "1500"
 
     def test_extracts_checkbox_state(self):
@@ -116,16 +116,16 @@ class TestMapWindowElements:
         )
 
         mapper = WindowMapper(max_depth=2)
-        elements = mapper.map_window_elements(window)
+        by_type = mapper.map_window_elements(window)
 
-        cb_elem = next(e for e in elements if e["name"] == "Agree")
+        cb_elem = next(e for e in by_type["CheckBox"] if e["name"] == "Agree")
         assert cb_elem["checked"] == 0
 
     def test_respects_depth_limit(self, mock_window):
         mapper = WindowMapper(max_depth=0)
-        elements = mapper.map_window_elements(mock_window)
+        by_type = mapper.map_window_elements(mock_window)
 
-        assert len(elements) == 0
+        assert by_type == {}
 
     def test_skips_elements_without_id_or_name(self):
         anon = make_mock_element(
@@ -140,27 +140,16 @@ class TestMapWindowElements:
         )
 
         mapper = WindowMapper(max_depth=2)
-        elements = mapper.map_window_elements(window)
+        by_type = mapper.map_window_elements(window)
 
-        assert len(elements) == 0
+        assert by_type == {}
 
 
 class TestRun:
     """Test full mapping workflow."""
 
-    @patch("win_gui_inspector.mapper._ensure_utf8_output")
-    @patch("win_gui_inspector.mapper.Application")
-    @patch("win_gui_inspector.mapper.Desktop")
-    def test_run_exports_json(
-        self, mock_desktop_cls, mock_app_cls, _mock_utf8, mock_window, tmp_path
-    ):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-        mock_desktop.windows.return_value = [mock_window]
-
-        mock_app = MagicMock()
-        mock_app_cls.return_value.connect.return_value = mock_app
-        mock_app.window.return_value = mock_window
+    def test_run_exports_json(self, desktop_mock, mock_window, tmp_path):
+        desktop_mock.windows.return_value = [mock_window]
 
         output = tmp_path / "map.json"
         mapper = WindowMapper(max_depth=4)
@@ -173,12 +162,24 @@ class TestRun:
             data = json.load(f)
         assert "Test Window" in data
 
-    @patch("win_gui_inspector.mapper._ensure_utf8_output")
-    @patch("win_gui_inspector.mapper.Desktop")
-    def test_run_no_windows(self, mock_desktop_cls, _mock_utf8):
-        mock_desktop = MagicMock()
-        mock_desktop_cls.return_value = mock_desktop
-        mock_desktop.windows.return_value = []
+    def test_run_quiet_suppresses_listing(self, desktop_mock, mock_window, capsys):
+        desktop_mock.windows.return_value = [mock_window]
+        mapper = WindowMapper(max_depth=4)
+
+        mapper.run(quiet=False)
+        loud = capsys.readouterr().out
+        mapper.run(quiet=True)
+        quiet = capsys.readouterr().out
+
+        assert "[  116] Buy" in loud
+        assert "elements:" in loud
+        # Quiet mode keeps the per-window banners but drops the listing.
+        assert "MAPPING: Test Window" in quiet
+        assert "[  116] Buy" not in quiet
+        assert "elements:" not in quiet
+
+    def test_run_no_windows(self, desktop_mock):
+        desktop_mock.windows.return_value = []
 
         mapper = WindowMapper()
         result = mapper.run()